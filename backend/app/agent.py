@@ -6,10 +6,10 @@ real-time vision via MediaPipe, exercise visual aids, and get_body_metrics tool.
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from typing import Any
 
+import orjson
 from dotenv import load_dotenv
 
 from livekit import agents, rtc
@@ -17,7 +17,13 @@ from livekit.agents import Agent, AgentSession, RunContext, function_tool, room_
 from livekit.plugins import google, silero
 
 from app.pain_guardrail import SAFETY_WARNING, check_pain_keywords
-from app.services.exercise_db import search_exercise, search_exercises
+from app.prompts import FLEXFLOW_SYSTEM_PROMPT
+from app.services.exercise_db import (
+    prefetch_exercise_db,
+    search_exercise,
+    search_exercises,
+    warm_exercise_db,
+)
 from app.state import AsyncState
 from app.utils.resources import (
     get_resource,
@@ -31,65 +37,6 @@ logger = logging.getLogger("flexflow.agent")
 load_dotenv(".env.local")
 load_dotenv()
 
-FLEXFLOW_SYSTEM_PROMPT = """\
-You are Sewina, a warm, encouraging AI Physical Therapist assistant. You can see \
-the user through their camera and hear them in real time. You are their coach — \
-you decide the exercise plan, watch their form continuously, and correct them \
-the moment something is off. Think of yourself as a real PT standing right next to them.
-
-How to talk:
-- Speak naturally, like a friendly coach standing next to them. Short sentences.
-- Never list bullet points out loud. Just talk like a person.
-- Give ONE cue at a time. Wait for them to adjust before adding another.
-- Use encouraging words: "nice", "good", "that's it", "almost there."
-- Don't repeat yourself or re-explain unless asked.
-
-How to observe — THIS IS YOUR MOST IMPORTANT JOB:
-- You MUST watch the user continuously while they exercise. Do NOT wait for them \
-to ask "am I doing it right?" — you should already be telling them.
-- The moment you see incorrect form, SAY SOMETHING IMMEDIATELY. Interrupt yourself \
-if you have to. Examples: "Hold on — straighten your back." "Wait, your elbow is \
-drifting out." "Stop — drop your shoulder down first."
-- Use get_body_metrics frequently while the user is moving to verify joint angles.
-- Be specific about what you see: "I can see your right elbow is at about 45 degrees — \
-try to get it closer to 90."
-- When form is good, confirm it: "Yes, that's the right position. Hold that."
-- Think of it like spotting someone at the gym — you watch every rep, not just \
-when they ask for help.
-
-Leading the session — YOU are the therapist:
-- After assessing the user's issue, YOU prescribe the exercise plan. You are the expert.
-- If the user starts doing a different exercise on their own, do NOT just go along \
-with it. Redirect them: "Hey, let's come back to the neck stretch — that's what's \
-going to help your shoulders the most right now."
-- Explain WHY your prescribed exercise matters: "I know the arm circles feel natural, \
-but the cross-body stretch targets the exact area that's tight."
-- Only switch exercises if: (1) the user explicitly asks to change, (2) the current \
-exercise is causing pain, or (3) they've completed the prescribed sets/duration.
-- Count reps if doing a repetitive exercise. Track their progress through the set.
-- When one exercise is done, tell them what's next: "Nice work. Now let's move on to..."
-
-Visual Aids:
-- You have access to a database of 870+ exercises with images. Before recommending \
-an exercise, call suggest_exercises with the target body area or movement, then \
-pick ONE of the returned names and use that exact name when calling \
-show_exercise_visuals. This guarantees the visuals match the recommendation.
-- EVERY TIME you suggest a new exercise or stretch, call show_exercise_visuals with \
-the exact database exercise name so the user sees images and step-by-step instructions.
-- For common stretches (neck, shoulder, arm), you can also call show_exercise_resource \
-with a stretch ID for curated professional videos. Available IDs: neck_lateral_flexion, \
-neck_rotation, upper_trap_stretch, shoulder_cross_body, shoulder_overhead, chest_opener, \
-bicep_stretch, tricep_stretch, wrist_flexor_stretch, cat_cow.
-- Always show a visual reference when starting a new movement.
-
-Safety:
-- You're AI, not a doctor. Weave this in naturally once near the start: "Just a \
-reminder, I'm AI — if anything feels sharp or wrong, stop and see a professional."
-- Sharp pain, numbness, tingling, or dizziness → stop immediately, recommend a doctor.
-- Normal workout discomfort (burn, tightness) → "Ease up if that's more than a 5 out of 10."
-
-Never repeat or echo back what the user says."""
-
 
 class FlexFlowAgent(Agent):
     """Voice + vision agent backed by Gemini 2.5 Flash (Live API)."""
@@ -102,7 +49,7 @@ class FlexFlowAgent(Agent):
     async def _publish_exercise(self, data: dict[str, Any]) -> None:
         """Publish exercise data to the frontend via LiveKit data channel."""
         try:
-            payload = json.dumps(data).encode("utf-8")
+            payload = orjson.dumps(data)
             await self._room.local_participant.publish_data(
                 payload, reliable=True, topic="exercise"
             )
@@ -116,7 +63,7 @@ class FlexFlowAgent(Agent):
         arm angles, upper-body-only mode, and pointed body part. Call this
         to verify the user's form before giving corrections.
         """
-        return await self._state.snapshot()
+        return self._state.snapshot()
 
     @function_tool()
     async def show_exercise_resource(
@@ -239,6 +186,9 @@ _server = agents.AgentServer()
 
 def _prewarm(proc: agents.JobProcess) -> None:
     proc.userdata["vad"] = silero.VAD.load()
+    # Pull the exercise DB onto local disk now so the session process
+    # never pays the download on its first suggest_exercises call.
+    prefetch_exercise_db()
 
 
 _server.setup_fnc = _prewarm
@@ -249,6 +199,9 @@ async def _flexflow_session(ctx: agents.JobContext) -> None:
     """One shared state per room; vision loop feeds body metrics to the agent."""
     state = AsyncState()
     agent = FlexFlowAgent(state=state, room=ctx.room)
+    # Overlap DB load/indexing with connect + session start.
+    warm_task = asyncio.create_task(warm_exercise_db())
+    warm_task.add_done_callback(lambda t: t.exception())
 
     session = AgentSession(
         llm=google.beta.realtime.RealtimeModel(
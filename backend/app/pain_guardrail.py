@@ -6,8 +6,19 @@ and deliver a safety warning. No PHI/PII in logs.
 
 from __future__ import annotations
 
+import re
+
 PAIN_KEYWORDS = frozenset({"ouch", "hurts", "pain", "stop"})
 
+# Compiled once at import; checked on every transcript chunk, so a single
+# C-level regex scan beats lowercasing + splitting + set intersection per call.
+# re.ASCII keeps \b and case folding in the fast ASCII path — the keywords
+# are plain ASCII, so Unicode word/case semantics buy nothing here.
+_PAIN_RE = re.compile(
+    r"\b(?:" + "|".join(sorted(PAIN_KEYWORDS)) + r")\b",
+    re.IGNORECASE | re.ASCII,
+)
+
 SAFETY_WARNING = (
     "Stop the exercise immediately. I'm not a doctor. "
     "If you're in pain, please consult a healthcare provider before continuing."
@@ -18,10 +29,4 @@ def check_pain_keywords(transcript: str) -> bool:
     """
     Returns True if the transcript contains any pain keyword (case-insensitive).
     """
-    if not transcript or not transcript.strip():
-        return False
-    lower = transcript.strip().lower()
-    words = set(lower.split())
-    return bool(words & PAIN_KEYWORDS) or any(
-        kw in lower for kw in PAIN_KEYWORDS
-    )
+    return bool(transcript) and _PAIN_RE.search(transcript) is not None
@@ -14,11 +14,20 @@ Search uses:
 
 from __future__ import annotations
 
+import gzip
+import heapq
+import importlib.resources
 import logging
+import os
 import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
 import httpx
+import orjson
 
 logger = logging.getLogger("flexflow.exercise_db")
 
@@ -31,8 +40,75 @@ _IMAGE_BASE = (
     "/main/exercises"
 )
 
+# Filesystem cache so each process restart reads ~1 MB locally instead of
+# re-downloading it. FLEXFLOW_EXERCISE_DB_PATH lets container images bake
+# the file in at build time.
+_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+
 _cache: list[dict[str, Any]] | None = None
 _name_index: dict[str, dict[str, Any]] | None = None
+_postings: dict[str, set[int]] | None = None
+_resolved_overrides: dict[str, dict[str, Any]] = {}
+
+# One shared client so repeated fetches reuse the connection pool instead
+# of paying DNS + TLS setup inside a per-call context manager.
+_http = httpx.AsyncClient(
+    timeout=20.0,
+    http2=True,
+    headers={"User-Agent": "flexflow/0.1"},
+)
+
+
+async def aclose_http_client() -> None:
+    """Close the shared HTTP client; call on process shutdown."""
+    await _http.aclose()
+
+
+def _disk_cache_path() -> Path:
+    override = os.getenv("FLEXFLOW_EXERCISE_DB_PATH")
+    if override:
+        return Path(override)
+    base = Path(os.getenv("XDG_CACHE_HOME", str(Path.home() / ".cache")))
+    return base / "flexflow" / "exercises.json"
+
+
+def _read_disk_cache(path: Path, *, allow_stale: bool = False) -> list[dict[str, Any]] | None:
+    """Return the cached exercise list, or None if missing/stale/corrupt."""
+    try:
+        if not path.is_file():
+            return None
+        fresh = time.time() - path.stat().st_mtime < _CACHE_MAX_AGE
+        if not (fresh or allow_stale or os.getenv("FLEXFLOW_EXERCISE_DB_PATH")):
+            return None
+        return orjson.loads(path.read_bytes())
+    except Exception:
+        logger.warning("Ignoring unreadable exercise cache at %s", path)
+        return None
+
+
+# Optional packaged copy of the DB, produced by scripts/build_exercise_db.py
+# and shipped next to this module so deployments never touch the network.
+_PACKAGED_DB = "exercises.json.gz"
+
+
+def _read_packaged_db() -> list[dict[str, Any]] | None:
+    """Return the exercise list bundled with the package, if present."""
+    try:
+        res = importlib.resources.files(__package__).joinpath(_PACKAGED_DB)
+        if not res.is_file():
+            return None
+        return orjson.loads(gzip.decompress(res.read_bytes()))
+    except Exception:
+        logger.warning("Ignoring unreadable packaged exercise DB")
+        return None
+
+
+def _write_disk_cache(path: Path, content: bytes) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    except OSError:
+        logger.warning("Could not write exercise cache to %s", path)
 
 # ── Synonym map ──────────────────────────────────────────────────────
 # Maps common PT terms to the muscle names used in the database.
@@ -79,87 +155,272 @@ _SYNONYMS: dict[str, list[str]] = {
     "wrist": ["forearms"],
 }
 
+# Queries that should pin a specific, hand-picked exercise.
+_QUERY_OVERRIDES: dict[str, str] = {
+    "upper trapezius stretch": "Side Neck Stretch",
+    "upper trap stretch": "Side Neck Stretch",
+    "trap stretch": "Side Neck Stretch",
+    "trapezius stretch": "Side Neck Stretch",
+    "neck lateral flexion": "Side Neck Stretch",
+    "neck rotation stretch": "Neck-SMR",
+    "upper back stretch": "Upper Back Stretch",
+    "lower back stretch": "Chair Lower Back Stretch",
+    "shoulder cross body stretch": "Shoulder Stretch",
+    "chest opener stretch": "Behind Head Chest Stretch",
+    "cat cow": "Cat Stretch",
+}
+
+
+# Character trie over synonym and override phrases, built once at import.
+# Terminal nodes carry tagged payloads under the sentinel key None, so one
+# pass over the query yields both muscle targets and the override hit
+# instead of one substring scan per phrase.
+def _build_phrase_trie() -> dict[str, Any]:
+    root: dict[str, Any] = {}
+
+    def add(phrase: str, payload: tuple[str, Any]) -> None:
+        node = root
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node.setdefault(None, []).append(payload)
+
+    for phrase, targets in _SYNONYMS.items():
+        add(phrase, ("synonym", targets))
+    for phrase, name in _QUERY_OVERRIDES.items():
+        add(phrase, ("override", name))
+    return root
+
+
+_PHRASE_TRIE = _build_phrase_trie()
+
+# Bit per muscle name the synonym map can ever target, assigned at import.
+# Muscle overlap in _score then becomes an int AND + popcount instead of a
+# frozenset intersection — no hashing, no set allocation per exercise.
+_MUSCLE_BITS: dict[str, int] = {
+    m: 1 << i
+    for i, m in enumerate(sorted({m for ts in _SYNONYMS.values() for m in ts}))
+}
+
+
+def _muscle_mask(muscles: Any) -> int:
+    """Bitmask over _MUSCLE_BITS; muscles outside the vocabulary are ignored
+    (they can never intersect a query's target set)."""
+    mask = 0
+    for m in muscles:
+        mask |= _MUSCLE_BITS.get(m, 0)
+    return mask
+
 # Words that are too generic to drive a match on their own.
-_GENERIC_WORDS = {"stretch", "stretching", "exercise", "upper", "lower",
-                  "side", "front", "back", "the", "a", "and", "on", "to",
-                  "with", "for", "of", "left", "right", "seated", "standing"}
+_GENERIC_WORDS = frozenset({"stretch", "stretching", "exercise", "upper", "lower",
+                            "side", "front", "back", "the", "a", "and", "on", "to",
+                            "with", "for", "of", "left", "right", "seated", "standing"})
+
+
+def _build_postings(exercises: list[dict[str, Any]]) -> dict[str, set[int]]:
+    """Inverted index: name token / muscle / category → exercise indices.
+
+    Tokens ending in "s" are also posted singular so "curl" still finds
+    "Curls" after candidate pruning.
+    """
+    postings: dict[str, set[int]] = {}
+    for idx, ex in enumerate(exercises):
+        terms = set(ex["_name_tokens"])
+        terms.update(ex["_all_muscles"])
+        if ex["_category_lower"]:
+            terms.add(ex["_category_lower"])
+        for term in terms:
+            postings.setdefault(term, set()).add(idx)
+            if term.endswith("s"):
+                postings.setdefault(term[:-1], set()).add(idx)
+    return postings
+
+
+def _candidates(
+    ctx: QueryCtx, exercises: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Exercises worth scoring for this query.
+
+    Unions the postings for the query's meaningful tokens and target
+    muscles; anything outside that set can only reach a generic-only
+    score, which the thresholds in search_* discard anyway. Falls back
+    to the full list when the index is unavailable or nothing matches.
+    """
+    if _postings is None:
+        return exercises
+    terms = ctx.meaningful | ctx.target_muscles
+    if not terms:
+        return exercises
+    idxs: set[int] = set()
+    for term in terms:
+        idxs.update(_postings.get(term, ()))
+        if term.endswith("s"):
+            idxs.update(_postings.get(term[:-1], ()))
+    if not idxs:
+        return exercises
+    return [exercises[i] for i in sorted(idxs)]
+
+
+def _index_exercises(data: list[dict[str, Any]], source: str) -> list[dict[str, Any]]:
+    """Install the exercise list plus its lookup indexes as module state."""
+    global _cache, _name_index, _postings
+    for ex in data:
+        images = ex.get("images", [])
+        ex["_image_url"] = f"{_IMAGE_BASE}/{images[0]}" if images else ""
+        ex["_image_url_end"] = f"{_IMAGE_BASE}/{images[1]}" if len(images) > 1 else ""
+        # Lowercased/tokenized views so _score does set ops on prebuilt
+        # frozensets instead of re-normalizing 873 exercises per query.
+        ex["_name_lower"] = str(ex.get("name", "")).lower()
+        ex["_name_tokens"] = _tokenize_set(ex["_name_lower"])
+        ex["_primary_lower"] = frozenset(
+            m.lower() for m in ex.get("primaryMuscles", [])
+        )
+        ex["_secondary_lower"] = frozenset(
+            m.lower() for m in ex.get("secondaryMuscles", [])
+        )
+        ex["_all_muscles"] = ex["_primary_lower"] | ex["_secondary_lower"]
+        ex["_category_lower"] = str(ex.get("category", "")).lower()
+        ex["_primary_bits"] = _muscle_mask(ex["_primary_lower"])
+        ex["_secondary_bits"] = _muscle_mask(ex["_secondary_lower"])
+        ex["_all_bits"] = ex["_primary_bits"] | ex["_secondary_bits"]
+    _cache = data
+    _name_index = {
+        str(ex.get("name", "")).lower(): ex for ex in data if ex.get("name")
+    }
+    _postings = _build_postings(data)
+    # Resolve override targets to exercise dicts once, instead of a
+    # _name_index lookup on every override hit.
+    _resolved_overrides.clear()
+    for phrase, target in _QUERY_OVERRIDES.items():
+        ex = _name_index.get(target.lower())
+        if ex is None:
+            logger.warning("Override target %r not in exercise DB", target)
+            continue
+        _resolved_overrides[target] = ex
+    _search_cache_clear()
+    logger.info("Loaded %d exercises from %s", len(data), source)
+    return data
 
 
 async def _load_exercises() -> list[dict[str, Any]]:
-    """Download and cache the exercise database on first call."""
-    global _cache, _name_index
+    """Load the exercise database on first call: disk cache, then HTTPS."""
     if _cache is not None:
         return _cache
+
+    path = _disk_cache_path()
+    data = _read_disk_cache(path)
+    if data is not None:
+        return _index_exercises(data, f"disk cache ({path})")
+
+    data = _read_packaged_db()
+    if data is not None:
+        return _index_exercises(data, "packaged resource")
+
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            r = await client.get(_EXERCISES_URL)
-            r.raise_for_status()
-            _cache = r.json()
-            _name_index = {
-                str(ex.get("name", "")).lower(): ex for ex in _cache if ex.get("name")
-            }
-            logger.info("Loaded %d exercises from free-exercise-db", len(_cache))
-            return _cache
+        r = await _http.get(_EXERCISES_URL)
+        r.raise_for_status()
+        _write_disk_cache(path, r.content)
+        return _index_exercises(orjson.loads(r.content), "free-exercise-db")
     except Exception:
         logger.exception("Failed to load exercise database")
+        # A stale local copy beats no exercises at all.
+        data = _read_disk_cache(path, allow_stale=True)
+        if data is not None:
+            return _index_exercises(data, f"stale disk cache ({path})")
         return []
 
 
-def _tokenize(text: str) -> list[str]:
-    """Split into lowercase alpha tokens."""
-    return re.findall(r"[a-z]+", text.lower())
+_TOKEN_RE = re.compile(r"[a-z]+")
 
 
-def _expand_synonyms(query: str) -> set[str]:
-    """Return muscle names that the query might be referring to."""
-    muscles: set[str] = set()
-    q = query.lower()
-    for phrase, targets in _SYNONYMS.items():
-        if phrase in q:
-            muscles.update(targets)
-    return muscles
+def _tokenize(text: str) -> list[str]:
+    """Split into lowercase alpha tokens (order and duplicates preserved)."""
+    return _TOKEN_RE.findall(text.casefold())
 
 
-_QUERY_OVERRIDES: dict[str, str] = {
-    "upper trapezius stretch": "Side Neck Stretch",
-    "upper trap stretch": "Side Neck Stretch",
-    "trap stretch": "Side Neck Stretch",
-    "trapezius stretch": "Side Neck Stretch",
-    "neck lateral flexion": "Side Neck Stretch",
-    "neck rotation stretch": "Neck-SMR",
-    "upper back stretch": "Upper Back Stretch",
-    "lower back stretch": "Chair Lower Back Stretch",
-    "shoulder cross body stretch": "Shoulder Stretch",
-    "chest opener stretch": "Behind Head Chest Stretch",
-    "cat cow": "Cat Stretch",
-}
+def _tokenize_set(text: str) -> frozenset[str]:
+    """Tokenize straight into a frozenset for callers that only do set ops."""
+    return frozenset(_TOKEN_RE.findall(text.casefold()))
 
 
-def _override_match(query: str) -> dict[str, Any] | None:
-    if _name_index is None:
-        return None
-    q = query.lower().strip()
-    for key, name in _QUERY_OVERRIDES.items():
-        if key in q:
-            return _name_index.get(name.lower())
-    return None
+def _match_query(query: str) -> tuple[set[str], str | None]:
+    """One trie pass over the query: (muscle targets, override exercise name).
 
-
-def _score(query: str, exercise: dict[str, Any]) -> float:
+    When several override phrases match, the longest wins, instead of
+    whichever happened to come first in _QUERY_OVERRIDES insertion order.
+    """
+    muscles: set[str] = set()
+    override: str | None = None
+    override_len = 0
+    q = query.lower()
+    n = len(q)
+    for start in range(n):
+        node = _PHRASE_TRIE
+        for i in range(start, n):
+            node = node.get(q[i])
+            if node is None:
+                break
+            payloads = node.get(None)
+            if payloads is None:
+                continue
+            for kind, value in payloads:
+                if kind == "synonym":
+                    muscles.update(value)
+                elif i - start + 1 > override_len:
+                    override = value
+                    override_len = i - start + 1
+    return muscles, override
+
+
+@dataclass(frozen=True)
+class QueryCtx:
+    """Query-side scoring context, computed once per search (not per exercise)."""
+
+    q_lower: str
+    meaningful: frozenset[str]
+    generic: frozenset[str]
+    target_muscles: frozenset[str]
+    target_bits: int
+    wants_stretch: bool
+    override_name: str | None
+
+
+@lru_cache(maxsize=256)
+def _build_query_ctx(query: str) -> QueryCtx:
+    """Precompute the query-invariant parts of _score.
+
+    The LLM repeats a small set of queries ("neck stretch", ...), so the
+    LRU cache also skips tokenization and synonym expansion entirely on
+    repeat calls.
+    """
+    q_lower = query.lower().strip()
+    q_tokens = _tokenize_set(q_lower)
+    muscles, override_name = _match_query(q_lower)
+    target_muscles = frozenset(muscles)
+    return QueryCtx(
+        q_lower=q_lower,
+        meaningful=q_tokens - _GENERIC_WORDS,
+        generic=q_tokens & _GENERIC_WORDS,
+        target_muscles=target_muscles,
+        target_bits=_muscle_mask(target_muscles),
+        wants_stretch=any(
+            w in q_lower for w in ("stretch", "stretching", "flexibility")
+        ),
+        override_name=override_name,
+    )
+
+
+def _score(ctx: QueryCtx, exercise: dict[str, Any]) -> float:
     """
     Score an exercise against a query.  Higher = better match.
     Returns 0 for no match.
     """
-    q_lower = query.lower().strip()
-    name_lower = exercise.get("name", "").lower()
-    q_tokens = _tokenize(q_lower)
-    name_tokens = set(_tokenize(name_lower))
-    primary = [m.lower() for m in exercise.get("primaryMuscles", [])]
-    secondary = [m.lower() for m in exercise.get("secondaryMuscles", [])]
-    all_muscles = set(primary + secondary)
-    category = exercise.get("category", "").lower()
+    q_lower = ctx.q_lower
+    name_lower = exercise["_name_lower"]
+    name_tokens = exercise["_name_tokens"]
+    category = exercise["_category_lower"]
 
     score = 0.0
+    meaningful_hits = len(ctx.meaningful & name_tokens)
 
     # ── 1. Name matching ────────────────────────────────────────────
     if q_lower == name_lower:
@@ -167,13 +428,10 @@ def _score(query: str, exercise: dict[str, Any]) -> float:
     elif q_lower in name_lower:
         score += 80
     else:
-        meaningful = [t for t in q_tokens if t not in _GENERIC_WORDS]
-        generic = [t for t in q_tokens if t in _GENERIC_WORDS]
-        meaningful_hits = sum(1 for t in meaningful if t in name_tokens)
-        generic_hits = sum(1 for t in generic if t in name_tokens)
+        generic_hits = len(ctx.generic & name_tokens)
 
-        if meaningful and meaningful_hits > 0:
-            score += (meaningful_hits / len(meaningful)) * 60
+        if ctx.meaningful and meaningful_hits > 0:
+            score += (meaningful_hits / len(ctx.meaningful)) * 60
             score += generic_hits * 2
         elif generic_hits > 0:
             score += generic_hits * 3
@@ -181,39 +439,118 @@ def _score(query: str, exercise: dict[str, Any]) -> float:
             pass
 
     # ── 2. Muscle matching ──────────────────────────────────────────
-    target_muscles = _expand_synonyms(q_lower)
-    if target_muscles:
-        primary_hits = len(target_muscles & set(primary))
-        secondary_hits = len(target_muscles & set(secondary))
+    target_bits = ctx.target_bits
+    if target_bits:
+        primary_hits = (target_bits & exercise["_primary_bits"]).bit_count()
+        secondary_hits = (target_bits & exercise["_secondary_bits"]).bit_count()
         if primary_hits > 0:
             score += 40 * primary_hits
         if secondary_hits > 0:
             score += 15 * secondary_hits
 
     # ── 3. Category boosting ────────────────────────────────────────
-    wants_stretch = any(w in q_lower for w in ["stretch", "stretching", "flexibility"])
-    if wants_stretch and category == "stretching":
+    if ctx.wants_stretch and category == "stretching":
         score += 25
-    elif wants_stretch and category != "stretching":
+    elif ctx.wants_stretch and category != "stretching":
         score -= 10
 
     # ── 4. Penalty for generic-only matches ─────────────────────────
-    if score > 0:
-        meaningful = [t for t in q_tokens if t not in _GENERIC_WORDS]
-        if meaningful:
-            meaningful_in_name = sum(1 for t in meaningful if t in name_tokens)
-            meaningful_in_muscles = len(target_muscles & all_muscles)
-            if meaningful_in_name == 0 and meaningful_in_muscles == 0:
-                score *= 0.1
+    if score > 0 and ctx.meaningful:
+        if meaningful_hits == 0 and not target_bits & exercise["_all_bits"]:
+            score *= 0.1
 
     # ── 5. Cross-validation: query implies muscles but exercise misses them
-    if target_muscles and score > 0:
-        if not (target_muscles & all_muscles):
+    if target_bits and score > 0:
+        if not target_bits & exercise["_all_bits"]:
             score *= 0.2
 
     return score
 
 
+# Memo of finished search results keyed on the normalized query. The agent
+# repeats a small set of tool queries ("neck stretch", ...), so hits skip
+# candidate selection and scoring entirely. Oldest entries are evicted at
+# the cap; the whole memo is dropped when the database is (re)indexed.
+_SEARCH_CACHE_MAX = 512
+_single_cache: dict[str, dict[str, Any] | None] = {}
+_multi_cache: dict[tuple[str, int], list[dict[str, Any]]] = {}
+
+
+def _search_cache_clear() -> None:
+    _single_cache.clear()
+    _multi_cache.clear()
+
+
+def _cache_put(cache: dict, key: Any, value: Any) -> None:
+    if len(cache) >= _SEARCH_CACHE_MAX:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+
+
+def _upper_bound(ctx: QueryCtx, exercise: dict[str, Any]) -> float:
+    """Optimistic score: every bonus _score can add, none of its penalties.
+
+    Cheap enough to rank candidates so search_exercise can stop fully
+    scoring once no remaining candidate can beat the best so far.
+    """
+    name_lower = exercise["_name_lower"]
+    if ctx.q_lower == name_lower:
+        ub = 100.0
+    elif ctx.q_lower in name_lower:
+        ub = 80.0
+    else:
+        ub = 60.0 + 2 * len(ctx.generic)
+    target_bits = ctx.target_bits
+    if target_bits:
+        ub += 40 * (target_bits & exercise["_primary_bits"]).bit_count()
+        ub += 15 * (target_bits & exercise["_secondary_bits"]).bit_count()
+    if ctx.wants_stretch:
+        ub += 25
+    return ub
+
+
+def _score_all(
+    ctx: QueryCtx, candidates: list[dict[str, Any]]
+) -> list[tuple[float, dict[str, Any]]]:
+    """Score a candidate batch in a single comprehension pass.
+
+    After index pruning the batch is usually a few dozen exercises, so
+    per-row work is dominated by _score itself; one C-level loop with
+    the function bound locally is the cheapest dispatch available.
+    """
+    score = _score
+    return [(score(ctx, ex), ex) for ex in candidates]
+
+
+def prefetch_exercise_db() -> None:
+    """Best-effort synchronous prefetch of the DB into the disk cache.
+
+    Meant for worker prewarm, which runs in a plain sync context in a
+    separate process; session processes then load from local disk
+    instead of paying the HTTPS round trip on the first tool call.
+    """
+    try:
+        if os.getenv("FLEXFLOW_EXERCISE_DB_PATH"):
+            # Pinned file: never expired, never overwritten.
+            return
+        path = _disk_cache_path()
+        if path.is_file() and time.time() - path.stat().st_mtime < _CACHE_MAX_AGE:
+            return
+        if _read_packaged_db() is not None:
+            return
+        r = httpx.get(_EXERCISES_URL, timeout=20.0)
+        r.raise_for_status()
+        _write_disk_cache(path, r.content)
+        logger.info("Prefetched exercise DB to %s", path)
+    except Exception:
+        logger.warning("Exercise DB prefetch failed; will fetch lazily")
+
+
+async def warm_exercise_db() -> None:
+    """Load and index the DB ahead of the first search tool call."""
+    await _load_exercises()
+
+
 async def search_exercise(name: str) -> dict[str, Any] | None:
     """
     Search the exercise database by name. Returns the best match with
@@ -223,38 +560,51 @@ async def search_exercise(name: str) -> dict[str, Any] | None:
     if not exercises:
         return None
 
-    override = _override_match(name)
-    if override is not None:
-        best = override
-        best_score = 100.0
-    else:
-        best = None
-        best_score = 0.0
+    key = name.lower().strip()
+    if key in _single_cache:
+        hit = _single_cache[key]
+        return dict(hit) if hit is not None else None
+
+    ctx = _build_query_ctx(name)
+    best: dict[str, Any] | None = None
+    best_score = 0.0
+    if ctx.override_name is not None:
+        best = _resolved_overrides.get(ctx.override_name)
+        if best is not None:
+            best_score = 100.0
 
     if best is None:
-        for ex in exercises:
-            s = _score(name, ex)
+        ranked = sorted(
+            ((_upper_bound(ctx, ex), ex) for ex in _candidates(ctx, exercises)),
+            key=lambda t: t[0],
+            reverse=True,
+        )
+        for ub, ex in ranked:
+            # Candidates are ordered by optimistic score; once that bound
+            # can't beat the best (or the 15-point floor), nothing later can.
+            if ub <= max(best_score, 14.0):
+                break
+            s = _score(ctx, ex)
             if s > best_score:
                 best_score = s
                 best = ex
 
     if best is None or best_score < 15:
+        _cache_put(_single_cache, key, None)
         return None
 
-    images = best.get("images", [])
-    image_url = f"{_IMAGE_BASE}/{images[0]}" if images else ""
-    image_url_end = f"{_IMAGE_BASE}/{images[1]}" if len(images) > 1 else ""
-
-    return {
+    result = {
         "name": best.get("name", ""),
-        "image_url": image_url,
-        "image_url_end": image_url_end,
+        "image_url": best.get("_image_url", ""),
+        "image_url_end": best.get("_image_url_end", ""),
         "instructions": best.get("instructions", []),
         "category": best.get("category", ""),
         "primary_muscles": best.get("primaryMuscles", []),
         "secondary_muscles": best.get("secondaryMuscles", []),
         "equipment": best.get("equipment", ""),
     }
+    _cache_put(_single_cache, key, result)
+    return dict(result)
 
 
 async def search_exercises(name: str, limit: int = 3) -> list[dict[str, Any]]:
@@ -263,22 +613,34 @@ async def search_exercises(name: str, limit: int = 3) -> list[dict[str, Any]]:
     if not exercises:
         return []
 
-    scored: list[tuple[float, dict[str, Any]]] = []
-    for ex in exercises:
-        s = _score(name, ex)
-        if s >= 5:
-            scored.append((s, ex))
+    key = (name.lower().strip(), limit)
+    if key in _multi_cache:
+        return [dict(r) for r in _multi_cache[key]]
+
+    ctx = _build_query_ctx(name)
+    # Bounded min-heap of the top `limit` hits — O(N log k) with no
+    # intermediate full list to sort. The negated candidate index breaks
+    # score ties in first-seen order (matching the previous stable sort)
+    # and keeps the dicts themselves from ever being compared.
+    heap: list[tuple[float, int, dict[str, Any]]] = []
+    for i, (s, ex) in enumerate(_score_all(ctx, _candidates(ctx, exercises))):
+        if s < 5:
+            continue
+        item = (s, -i, ex)
+        if len(heap) < limit:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
 
-    scored.sort(key=lambda t: t[0], reverse=True)
     results: list[dict[str, Any]] = []
 
-    for _s, ex in scored[:limit]:
-        images = ex.get("images", [])
+    for _s, _tie, ex in sorted(heap, reverse=True):
         results.append({
             "name": ex.get("name", ""),
-            "image_url": f"{_IMAGE_BASE}/{images[0]}" if images else "",
+            "image_url": ex.get("_image_url", ""),
             "category": ex.get("category", ""),
             "primary_muscles": ex.get("primaryMuscles", []),
         })
 
-    return results
+    _cache_put(_multi_cache, key, results)
+    return [dict(r) for r in results]
@@ -5,7 +5,6 @@ Holds vision-derived metrics and mode; all processing is in-memory.
 
 from __future__ import annotations
 
-import asyncio
 from typing import Any
 
 from pydantic import BaseModel, Field, PrivateAttr
@@ -13,8 +12,14 @@ from pydantic import BaseModel, Field, PrivateAttr
 
 class AsyncState(BaseModel):
     """
-    Real-time body metrics and session mode shared between
-    the vision loop and the Gemini agent. Thread-safe via asyncio.Lock.
+    Real-time body metrics and session mode shared between the vision
+    loop and the Gemini agent. The vision loop publishes one complete
+    metrics mapping per frame via publish() — a single reference swap,
+    no lock and no per-field checks — and snapshot() hands the current
+    mapping to readers, who treat it as immutable.
+
+    The field declarations below document the metrics schema and supply
+    the defaults served before the first frame arrives.
     """
 
     is_upper_body_only: bool = Field(
@@ -34,33 +39,21 @@ class AsyncState(BaseModel):
         description="Body part the user is pointing at or focusing on.",
     )
 
-    _lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+    _current: dict[str, Any] | None = PrivateAttr(default=None)
 
-    async def update(
-        self,
-        *,
-        is_upper_body_only: bool | None = None,
-        neck_angle: float | None = None,
-        arm_angles: dict[str, float] | None = None,
-        pointed_body_part: str | None = None,
-    ) -> None:
-        """Update state fields under lock."""
-        async with self._lock:
-            if is_upper_body_only is not None:
-                self.is_upper_body_only = is_upper_body_only
-            if neck_angle is not None:
-                self.neck_angle = neck_angle
-            if arm_angles is not None:
-                self.arm_angles = arm_angles
-            if pointed_body_part is not None:
-                self.pointed_body_part = pointed_body_part
+    def publish(self, snap: dict[str, Any]) -> None:
+        """Swap in a complete metrics mapping (one assignment per frame)."""
+        if not snap.get("pointed_body_part"):
+            snap["pointed_body_part"] = "(none)"
+        self._current = snap
 
-    async def snapshot(self) -> dict[str, Any]:
-        """Return a shallow copy of current state for tools (e.g. get_body_metrics)."""
-        async with self._lock:
-            return {
+    def snapshot(self) -> dict[str, Any]:
+        """Current metrics mapping for tools (e.g. get_body_metrics). Read-only."""
+        if self._current is None:
+            self._current = {
                 "is_upper_body_only": self.is_upper_body_only,
                 "neck_angle": self.neck_angle,
                 "arm_angles": dict(self.arm_angles),
                 "pointed_body_part": self.pointed_body_part or "(none)",
             }
+        return self._current
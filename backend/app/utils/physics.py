@@ -1,102 +1,81 @@
 """
-Vision math for FlexFlow: 3D neck tilt and elbow flexion using MediaPipe pose landmarks.
-All calculations use true 3D coordinates (x, y, z) for accurate joint angle measurement.
-Returns None when visibility < MIN_VISIBILITY_THRESHOLD.
+Vision math for FlexFlow: 3D neck tilt and elbow flexion from MediaPipe pose
+landmarks, structure-of-arrays style. The vision loop unpacks each frame's
+landmarks once into a (33, 4) float array (x, y, z, visibility) and all angle
+math here runs against that array — no per-landmark attribute access.
+Angles are None when visibility < MIN_VISIBILITY_THRESHOLD.
 """
 
 from __future__ import annotations
 
-import math
-from typing import Any
+import numpy as np
 
 MIN_VISIBILITY_THRESHOLD = 0.6
 
+# MediaPipe pose landmark indices used by the frame kernel.
+_NOSE = 0
+_LEFT_SHOULDER = 11
+_RIGHT_SHOULDER = 12
+_LEFT_ELBOW = 13
+_RIGHT_ELBOW = 14
+_LEFT_WRIST = 15
+_RIGHT_WRIST = 16
 
-def _visibility(landmark: Any) -> float:
-    """Get visibility from a MediaPipe landmark (0-1)."""
-    return getattr(landmark, "visibility", 1.0)
 
-
-def _point_3d(landmark: Any) -> tuple[float, float, float]:
-    """(x, y, z) in relative coords from MediaPipe landmark."""
-    return (float(landmark.x), float(landmark.y), float(landmark.z))
-
-
-def angle_degrees_3d(
-    p_a: tuple[float, float, float],
-    p_vertex: tuple[float, float, float],
-    p_c: tuple[float, float, float],
-) -> float:
-    """
-    Calculate angle at p_vertex between vectors (vertex -> p_a) and (vertex -> p_c) in 3D.
-    Uses dot product and magnitudes for true 3D angle measurement.
-    Returns angle in degrees [0, 180].
-    """
-    v1 = (p_a[0] - p_vertex[0], p_a[1] - p_vertex[1], p_a[2] - p_vertex[2])
-    v2 = (p_c[0] - p_vertex[0], p_c[1] - p_vertex[1], p_c[2] - p_vertex[2])
-
-    dot = v1[0] * v2[0] + v1[1] * v2[1] + v1[2] * v2[2]
-    mag1 = math.sqrt(v1[0] ** 2 + v1[1] ** 2 + v1[2] ** 2)
-    mag2 = math.sqrt(v2[0] ** 2 + v2[1] ** 2 + v2[2] ** 2)
-
-    if mag1 < 1e-6 or mag2 < 1e-6:
-        return 0.0
-
-    cos_angle = dot / (mag1 * mag2)
-    cos_angle = max(-1.0, min(1.0, cos_angle))
-    return math.degrees(math.acos(cos_angle))
-
-
-def neck_tilt_degrees(
-    nose: Any,
-    left_shoulder: Any,
-    right_shoulder: Any,
-) -> float | None:
+def compute_frame(
+    arr: np.ndarray,
+) -> tuple[float | None, float | None, float | None]:
     """
-    Neck tilt in 3D: angle of nose relative to shoulder mid-point (vertical reference).
-    MediaPipe pose: 0=nose, 11=left_shoulder, 12=right_shoulder.
-    Returns None if any landmark visibility < MIN_VISIBILITY_THRESHOLD.
+    Frame kernel: (neck tilt, left elbow flexion, right elbow flexion)
+    from a (33, 4) float landmark array (x, y, z, visibility).
+
+    Neck tilt is the 3D angle of the nose relative to the shoulder mid-point
+    against a vertical reference; elbow flexion is the angle at the elbow
+    between the shoulder->elbow and elbow->wrist vectors. All three angles
+    come out of one batched einsum/arccos pass over stacked (3, 3) point
+    arrays. Angles whose landmarks fall below MIN_VISIBILITY_THRESHOLD
+    are None.
     """
-    if (
-        _visibility(nose) < MIN_VISIBILITY_THRESHOLD
-        or _visibility(left_shoulder) < MIN_VISIBILITY_THRESHOLD
-        or _visibility(right_shoulder) < MIN_VISIBILITY_THRESHOLD
-    ):
-        return None
-
-    p_nose = _point_3d(nose)
-    p_ls = _point_3d(left_shoulder)
-    p_rs = _point_3d(right_shoulder)
-
-    mid_x = (p_ls[0] + p_rs[0]) / 2
-    mid_y = (p_ls[1] + p_rs[1]) / 2
-    mid_z = (p_ls[2] + p_rs[2]) / 2
-    shoulder_mid = (mid_x, mid_y, mid_z)
-
-    up = (mid_x, mid_y - 0.1, mid_z)
-
-    return angle_degrees_3d(up, shoulder_mid, p_nose)
-
-
-def elbow_flexion_degrees(
-    shoulder: Any,
-    elbow: Any,
-    wrist: Any,
-) -> float | None:
-    """
-    Elbow flexion in 3D: angle at elbow between shoulder->elbow and elbow->wrist vectors.
-    MediaPipe pose: 11/12=shoulders, 13/14=elbows, 15/16=wrists.
-    Returns None if any landmark visibility < MIN_VISIBILITY_THRESHOLD.
-    """
-    if (
-        _visibility(shoulder) < MIN_VISIBILITY_THRESHOLD
-        or _visibility(elbow) < MIN_VISIBILITY_THRESHOLD
-        or _visibility(wrist) < MIN_VISIBILITY_THRESHOLD
-    ):
-        return None
-
-    p_s = _point_3d(shoulder)
-    p_e = _point_3d(elbow)
-    p_w = _point_3d(wrist)
-
-    return angle_degrees_3d(p_s, p_e, p_w)
+    vis = arr[:, 3]
+    t = MIN_VISIBILITY_THRESHOLD
+    pts = arr[:, :3].astype(np.float64)
+
+    mid = (pts[_LEFT_SHOULDER] + pts[_RIGHT_SHOULDER]) * 0.5
+    up = mid.copy()
+    up[1] -= 0.1
+
+    # Row 0: neck (vertical ref / shoulder mid / nose); rows 1-2: elbows
+    # (shoulder / elbow / wrist).
+    p_a = np.stack((up, pts[_LEFT_SHOULDER], pts[_RIGHT_SHOULDER]))
+    p_v = np.stack((mid, pts[_LEFT_ELBOW], pts[_RIGHT_ELBOW]))
+    p_c = np.stack((pts[_NOSE], pts[_LEFT_WRIST], pts[_RIGHT_WRIST]))
+
+    v1 = p_a - p_v
+    v2 = p_c - p_v
+    dot = np.einsum("ij,ij->i", v1, v2)
+    mag1 = np.sqrt(np.einsum("ij,ij->i", v1, v1))
+    mag2 = np.sqrt(np.einsum("ij,ij->i", v2, v2))
+
+    # Degenerate (near-zero-length) vectors report 0 degrees.
+    ok = (mag1 >= 1e-6) & (mag2 >= 1e-6)
+    cos = np.clip(dot / np.where(ok, mag1 * mag2, 1.0), -1.0, 1.0)
+    ang = np.where(ok, np.degrees(np.arccos(cos)), 0.0)
+
+    neck = (
+        float(ang[0])
+        if vis[_NOSE] >= t and vis[_LEFT_SHOULDER] >= t and vis[_RIGHT_SHOULDER] >= t
+        else None
+    )
+    left = (
+        float(ang[1])
+        if vis[_LEFT_SHOULDER] >= t and vis[_LEFT_ELBOW] >= t and vis[_LEFT_WRIST] >= t
+        else None
+    )
+    right = (
+        float(ang[2])
+        if vis[_RIGHT_SHOULDER] >= t
+        and vis[_RIGHT_ELBOW] >= t
+        and vis[_RIGHT_WRIST] >= t
+        else None
+    )
+    return neck, left, right
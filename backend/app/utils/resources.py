@@ -7,13 +7,17 @@ for common Neck, Shoulder, and Arm stretches.
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 from pydantic import BaseModel
 
 
+_EMBED_RE = re.compile(r"/embed/([A-Za-z0-9_-]+)")
+
+
 def _youtube_thumbnail(embed_url: str) -> str:
     """Extract video ID from a YouTube embed URL and return a thumbnail."""
-    match = re.search(r"/embed/([A-Za-z0-9_-]+)", embed_url)
+    match = _EMBED_RE.search(embed_url)
     if not match:
         return ""
     return f"https://img.youtube.com/vi/{match.group(1)}/hqdefault.jpg"
@@ -119,21 +123,39 @@ EXERCISE_RESOURCES: dict[str, ExerciseResource] = {
 }
 
 
+# Lowercased (title, body_part, resource) triples, built once at import
+# so searches compare against cached strings instead of re-lowering every
+# resource on every call.
+_SEARCH_INDEX: list[tuple[str, str, ExerciseResource]] = [
+    (r.title.lower(), r.body_part.lower(), r)
+    for r in EXERCISE_RESOURCES.values()
+]
+
+
 def get_resource(stretch_id: str) -> ExerciseResource | None:
     """Look up a static exercise resource by ID."""
     return EXERCISE_RESOURCES.get(stretch_id)
 
 
+@lru_cache(maxsize=128)
 def search_static_resources(query: str) -> ExerciseResource | None:
-    """Fuzzy search static resources by title or body part."""
+    """Fuzzy search static resources by title or body part.
+
+    Memoized: the agent retries the same handful of body-part and stretch
+    names, and the resource map is fixed, so repeat queries are O(1).
+    """
     query_lower = query.lower()
-    for resource in EXERCISE_RESOURCES.values():
-        if query_lower in resource.title.lower() or query_lower in resource.body_part.lower():
-            return resource
-    for resource in EXERCISE_RESOURCES.values():
-        if any(word in resource.title.lower() for word in query_lower.split()):
+    words = query_lower.split()
+    # Single pass: whole-query matches win outright; the first per-word
+    # title match is kept as a fallback (same result order as the old
+    # two full scans).
+    word_match: ExerciseResource | None = None
+    for title_lc, body_part_lc, resource in _SEARCH_INDEX:
+        if query_lower in title_lc or query_lower in body_part_lc:
             return resource
-    return None
+        if word_match is None and any(word in title_lc for word in words):
+            word_match = resource
+    return word_match
 
 
 def list_resource_ids() -> list[str]:
@@ -1,29 +1,29 @@
 """
 VisionManager: real-time MediaPipe Pose processing on LiveKit video tracks.
-Uses the MediaPipe Tasks API (PoseLandmarker) with VIDEO running mode.
-Processes frames in a ThreadPoolExecutor (non-blocking), applies smoothing,
-writes body metrics to AsyncState, and publishes landmark positions to the
-room for frontend overlay rendering. Zero-storage; in-memory only.
+Uses the MediaPipe Tasks API (PoseLandmarker) with LIVE_STREAM running mode:
+frames go to detect_async and MediaPipe runs detection on its own worker
+thread, dropping frames natively under load. Results come back through a
+callback, get smoothed, written to AsyncState, and landmark positions are
+published to the room for frontend overlay rendering. Zero-storage;
+in-memory only.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-import math
 import time
-from collections import deque
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+import cv2
 import mediapipe as mp
 import numpy as np
+import orjson
 from livekit import rtc
 
 from app.state import AsyncState
-from app.utils.physics import elbow_flexion_degrees, neck_tilt_degrees
+from app.utils.physics import compute_frame
 
 logger = logging.getLogger("flexflow.vision")
 
@@ -39,6 +39,7 @@ _RIGHT_WRIST = 16
 _LEFT_INDEX = 19
 _RIGHT_INDEX = 20
 _LOWER_BODY = (25, 26, 27, 28, 29, 30, 31, 32)
+_LOWER_BODY_IDX = np.array(_LOWER_BODY, dtype=np.int32)
 
 _POINTING_TARGETS: dict[int, str] = {
     _LEFT_SHOULDER: "Left Shoulder",
@@ -48,11 +49,89 @@ _POINTING_TARGETS: dict[int, str] = {
     25: "Left Knee",
     26: "Right Knee",
 }
+# Frozen once at import — the targets never change, so the per-frame
+# pointing math indexes these instead of re-iterating the dict.
+_TARGET_IDX = np.fromiter(_POINTING_TARGETS.keys(), np.int32)
+_TARGET_LABELS = tuple(_POINTING_TARGETS.values())
 
 _LOWER_VIS_THRESHOLD = 0.5
 _POINTING_DIST_THRESHOLD = 0.1
 _SMOOTHING_SIZE = 5
 _LANDMARK_PUBLISH_INTERVAL = 0.1  # seconds (~10 fps)
+# pose_landmarker_lite works on a 256x256 model input, so anything wider
+# than this only adds CPU resize work inside MediaPipe. Landmark output
+# is normalized, so downscaling doesn't change any downstream math.
+_MAX_INPUT_WIDTH = 640
+
+
+class _Smoother:
+    """
+    O(1) moving average over the last _SMOOTHING_SIZE samples: a fixed
+    ring buffer plus a running sum, no per-call iterator or sum() loop.
+    Plain Python floats on purpose — indexing a float32 ndarray boxes a
+    new scalar object per access, which costs more than it saves at a
+    window of 5. None inputs return the last inserted value (or 0.0
+    before the first sample), matching the old deque behaviour.
+    """
+
+    __slots__ = ("_ring", "_idx", "_count", "_sum", "_last")
+
+    def __init__(self, size: int = _SMOOTHING_SIZE) -> None:
+        self._ring = [0.0] * size
+        self._idx = 0
+        self._count = 0
+        self._sum = 0.0
+        self._last = 0.0
+
+    def add(self, value: float | None) -> float:
+        if value is None:
+            return self._last
+        ring = self._ring
+        idx = self._idx
+        self._sum += value - ring[idx]
+        ring[idx] = value
+        self._idx = (idx + 1) % len(ring)
+        if self._count < len(ring):
+            self._count += 1
+        self._last = value
+        return self._sum / self._count
+
+
+def _landmarks_to_array(lm: Any) -> np.ndarray:
+    """Unpack MediaPipe landmarks once into a (33, 4) float32 array
+    (x, y, z, visibility) so per-frame math runs on contiguous slices
+    instead of ~200 Python attribute lookups."""
+    return np.array(
+        [(p.x, p.y, p.z, p.visibility) for p in lm],
+        dtype=np.float32,
+    )
+
+
+def _detect_pointing(arr: np.ndarray, vis_col: np.ndarray) -> str:
+    """Label of the pointing target nearest a visible index finger, or ''."""
+    target_xy = arr[_TARGET_IDX, :2]
+    target_vis = vis_col[_TARGET_IDX]
+    for finger_idx in (_LEFT_INDEX, _RIGHT_INDEX):
+        if vis_col[finger_idx] < _LOWER_VIS_THRESHOLD:
+            continue
+        # One vectorized distance computation against all targets,
+        # with low-visibility targets masked out.
+        dists = np.linalg.norm(target_xy - arr[finger_idx, :2], axis=1)
+        dists = np.where(target_vis < _LOWER_VIS_THRESHOLD, np.inf, dists)
+        j = int(np.argmin(dists))
+        if dists[j] < _POINTING_DIST_THRESHOLD:
+            return _TARGET_LABELS[j]
+    return ""
+
+
+def _round_landmarks(arr: np.ndarray) -> np.ndarray:
+    """Publish-ready copy of the landmark array: one vectorized rounding
+    pass instead of 132 round() calls, float64 so the values serialize
+    as short decimals. Rows stay flat [x, y, z, v] — no per-landmark
+    dicts or key strings on the wire; the frontend indexes by position."""
+    rounded = np.round(arr.astype(np.float64), 4)
+    rounded[:, 3] = np.round(rounded[:, 3], 2)
+    return rounded
 
 
 class VisionManager:
@@ -68,82 +147,73 @@ class VisionManager:
         self._state = state
         self._local_participant = local_participant
         self._running = False
-        self._executor = ThreadPoolExecutor(max_workers=1)
         self._last_publish = 0.0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # maxsize=1 gives latest-result semantics: the callback drops the
+        # stale result when the consumer falls behind, and the consumer
+        # wakes exactly when a result is ready.
+        self._result_q: asyncio.Queue[Any] = asyncio.Queue(maxsize=1)
+        # Double-buffered frame storage: the reader copies each incoming
+        # RGB buffer into the buffer the worker isn't holding, so no
+        # per-frame ndarray allocation happens on the event-loop thread.
+        self._frame_bufs: list[np.ndarray] = []
+        self._frame_buf_idx = 0
 
         options = mp.tasks.vision.PoseLandmarkerOptions(
             base_options=mp.tasks.BaseOptions(model_asset_path=_MODEL_PATH),
-            running_mode=mp.tasks.vision.RunningMode.VIDEO,
+            running_mode=mp.tasks.vision.RunningMode.LIVE_STREAM,
             num_poses=1,
+            result_callback=self._on_result,
         )
         self._landmarker = mp.tasks.vision.PoseLandmarker.create_from_options(options)
 
-        self._neck_buf: deque[float] = deque(maxlen=_SMOOTHING_SIZE)
-        self._left_elbow_buf: deque[float] = deque(maxlen=_SMOOTHING_SIZE)
-        self._right_elbow_buf: deque[float] = deque(maxlen=_SMOOTHING_SIZE)
+        self._neck_smooth = _Smoother()
+        self._left_elbow_smooth = _Smoother()
+        self._right_elbow_smooth = _Smoother()
 
-    @staticmethod
-    def _smooth(buf: deque[float], value: float | None) -> float:
-        if value is None:
-            return buf[-1] if buf else 0.0
-        buf.append(value)
-        return sum(buf) / len(buf)
+        # Warm the angle kernel once so the first real frame doesn't pay
+        # for lazy imports / first-call setup inside the vision loop.
+        compute_frame(np.zeros((33, 4), dtype=np.float32))
 
-    def _process_frame_sync(
-        self, rgb: np.ndarray, timestamp_ms: int
-    ) -> dict[str, Any] | None:
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
-        result = self._landmarker.detect_for_video(mp_image, timestamp_ms)
+    def _on_result(self, result: Any, image: mp.Image, timestamp_ms: int) -> None:
+        """MediaPipe result callback — runs on MediaPipe's worker thread."""
+        if self._loop is None or not self._running:
+            return
+        self._loop.call_soon_threadsafe(self._offer_result, result)
 
+    def _offer_result(self, result: Any) -> None:
+        try:
+            self._result_q.put_nowait(result)
+        except asyncio.QueueFull:
+            try:
+                self._result_q.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self._result_q.put_nowait(result)
+
+    def _process_result(self, result: Any) -> dict[str, Any] | None:
         if not result.pose_landmarks or len(result.pose_landmarks) == 0:
             return None
 
         lm = result.pose_landmarks[0]
+        arr = _landmarks_to_array(lm)
+        vis_col = arr[:, 3]
 
-        if all(getattr(lm[i], "visibility", 0.0) < 0.1 for i in range(33)):
+        if (vis_col < 0.1).all():
             return {"camera_covered": True}
 
-        vis = lambda idx: getattr(lm[idx], "visibility", 0.0)
-
-        is_upper_only = all(vis(i) < _LOWER_VIS_THRESHOLD for i in _LOWER_BODY)
-
-        pointed = ""
-        for finger_idx in (_LEFT_INDEX, _RIGHT_INDEX):
-            if vis(finger_idx) < _LOWER_VIS_THRESHOLD:
-                continue
-            fx, fy = lm[finger_idx].x, lm[finger_idx].y
-            min_dist = float("inf")
-            closest = ""
-            for target_idx, label in _POINTING_TARGETS.items():
-                if vis(target_idx) < _LOWER_VIS_THRESHOLD:
-                    continue
-                dist = math.sqrt(
-                    (fx - lm[target_idx].x) ** 2 + (fy - lm[target_idx].y) ** 2
-                )
-                if dist < _POINTING_DIST_THRESHOLD and dist < min_dist:
-                    min_dist = dist
-                    closest = label
-            if closest:
-                pointed = closest
-                break
-
-        neck = neck_tilt_degrees(lm[_NOSE], lm[_LEFT_SHOULDER], lm[_RIGHT_SHOULDER])
-        left_elbow = elbow_flexion_degrees(
-            lm[_LEFT_SHOULDER], lm[_LEFT_ELBOW], lm[_LEFT_WRIST]
-        )
-        right_elbow = elbow_flexion_degrees(
-            lm[_RIGHT_SHOULDER], lm[_RIGHT_ELBOW], lm[_RIGHT_WRIST]
+        is_upper_only = bool(
+            (vis_col[_LOWER_BODY_IDX] < _LOWER_VIS_THRESHOLD).all()
         )
 
-        landmarks = [
-            {
-                "x": round(lm[i].x, 4),
-                "y": round(lm[i].y, 4),
-                "z": round(lm[i].z, 4),
-                "v": round(vis(i), 2),
-            }
-            for i in range(33)
-        ]
+        pointed = _detect_pointing(arr, vis_col)
+        neck, left_elbow, right_elbow = compute_frame(arr)
+
+        # Only build the publish buffer when the publish gate will fire;
+        # at 30 fps ~2 of every 3 frames skip the rounding pass entirely.
+        landmarks = None
+        if time.monotonic() - self._last_publish >= _LANDMARK_PUBLISH_INTERVAL:
+            landmarks = _round_landmarks(arr)
 
         return {
             "is_upper_body_only": is_upper_only,
@@ -154,13 +224,14 @@ class VisionManager:
             "landmarks": landmarks,
         }
 
-    async def _publish_landmarks(self, landmarks: list[dict[str, float]]) -> None:
-        now = time.monotonic()
-        if now - self._last_publish < _LANDMARK_PUBLISH_INTERVAL:
-            return
-        self._last_publish = now
+    async def _publish_landmarks(self, landmarks: np.ndarray) -> None:
+        # Throttling happens upstream in _process_result, which only
+        # builds a payload once per _LANDMARK_PUBLISH_INTERVAL.
+        self._last_publish = time.monotonic()
         try:
-            payload = json.dumps({"l": landmarks}).encode("utf-8")
+            payload = orjson.dumps(
+                {"l": landmarks}, option=orjson.OPT_SERIALIZE_NUMPY
+            )
             await self._local_participant.publish_data(
                 payload, reliable=False, topic="landmarks"
             )
@@ -169,64 +240,82 @@ class VisionManager:
 
     async def run(self) -> None:
         self._running = True
-        loop = asyncio.get_event_loop()
+        self._loop = asyncio.get_running_loop()
         video_stream = rtc.VideoStream(
             self._track, format=rtc.VideoBufferType.RGB24
         )
 
-        latest: tuple[np.ndarray, int] | None = None
-
         async def _read_frames() -> None:
-            nonlocal latest
             async for event in video_stream:
                 if not self._running:
                     break
                 buf = event.frame
-                arr = np.frombuffer(buf.data, dtype=np.uint8)
-                frame = arr.reshape((buf.height, buf.width, 3)).copy()
+                view = np.frombuffer(buf.data, dtype=np.uint8).reshape(
+                    (buf.height, buf.width, 3)
+                )
+                h, w = view.shape[:2]
+                if w > _MAX_INPUT_WIDTH:
+                    out_w = _MAX_INPUT_WIDTH
+                    out_h = max(1, round(h * _MAX_INPUT_WIDTH / w))
+                else:
+                    out_w, out_h = w, h
+                shape = (out_h, out_w, 3)
+                if not self._frame_bufs or self._frame_bufs[0].shape != shape:
+                    self._frame_bufs = [
+                        np.empty(shape, dtype=np.uint8) for _ in range(2)
+                    ]
+                self._frame_buf_idx ^= 1
+                frame = self._frame_bufs[self._frame_buf_idx]
+                if (out_h, out_w) != (h, w):
+                    cv2.resize(
+                        view,
+                        (out_w, out_h),
+                        dst=frame,
+                        interpolation=cv2.INTER_AREA,
+                    )
+                else:
+                    np.copyto(frame, view)
                 ts_ms = event.timestamp_us // 1000
-                latest = (frame, ts_ms)
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame)
+                # Non-blocking: detection runs on MediaPipe's thread and
+                # lands in _on_result.
+                self._landmarker.detect_async(mp_image, ts_ms)
 
         reader = asyncio.create_task(_read_frames())
 
         try:
             while self._running:
-                if latest is None:
-                    await asyncio.sleep(0.05)
-                    continue
-
-                frame, ts_ms = latest
-                latest = None
+                raw = await self._result_q.get()
 
-                result = await loop.run_in_executor(
-                    self._executor, self._process_frame_sync, frame, ts_ms
-                )
+                result = self._process_result(raw)
 
                 if result is None:
                     continue
 
                 if result.get("camera_covered"):
-                    await self._state.update(
-                        is_upper_body_only=True, pointed_body_part=""
-                    )
+                    snap = dict(self._state.snapshot())
+                    snap["is_upper_body_only"] = True
+                    snap["pointed_body_part"] = ""
+                    self._state.publish(snap)
                     continue
 
-                neck_s = self._smooth(self._neck_buf, result["neck_angle"])
-                left_s = self._smooth(self._left_elbow_buf, result["left_elbow"])
-                right_s = self._smooth(self._right_elbow_buf, result["right_elbow"])
+                neck_s = self._neck_smooth.add(result["neck_angle"])
+                left_s = self._left_elbow_smooth.add(result["left_elbow"])
+                right_s = self._right_elbow_smooth.add(result["right_elbow"])
 
-                await self._state.update(
-                    is_upper_body_only=result["is_upper_body_only"],
-                    neck_angle=round(neck_s, 1),
-                    arm_angles={
+                self._state.publish({
+                    "is_upper_body_only": result["is_upper_body_only"],
+                    "neck_angle": round(neck_s, 1),
+                    "arm_angles": {
                         "left_elbow": round(left_s, 1),
                         "right_elbow": round(right_s, 1),
                     },
-                    pointed_body_part=result["pointed_body_part"],
-                )
+                    "pointed_body_part": result["pointed_body_part"],
+                })
 
-                if result.get("landmarks"):
-                    await self._publish_landmarks(result["landmarks"])
+                landmarks = result.get("landmarks")
+                if landmarks is not None:
+                    await self._publish_landmarks(landmarks)
         except asyncio.CancelledError:
             pass
         except Exception:
@@ -238,4 +327,3 @@ class VisionManager:
     async def close(self) -> None:
         self._running = False
         self._landmarker.close()
-        self._executor.shutdown(wait=False)
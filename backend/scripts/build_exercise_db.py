@@ -0,0 +1,39 @@
+"""
+Build-time fetch of the free-exercise-db for packaging.
+Downloads exercises.json and writes a gzipped copy next to
+app/services/exercise_db.py so deployed images load the database from
+disk instead of hitting GitHub on cold start.
+
+Usage (from backend/):
+    python scripts/build_exercise_db.py
+"""
+
+from __future__ import annotations
+
+import gzip
+import sys
+from pathlib import Path
+
+import httpx
+
+_EXERCISES_URL = (
+    "https://raw.githubusercontent.com/yuhonas/free-exercise-db"
+    "/main/dist/exercises.json"
+)
+_OUT_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "app" / "services" / "exercises.json.gz"
+)
+
+
+def main() -> int:
+    print(f"Fetching {_EXERCISES_URL} ...")
+    r = httpx.get(_EXERCISES_URL, timeout=30.0, follow_redirects=True)
+    r.raise_for_status()
+    _OUT_PATH.write_bytes(gzip.compress(r.content, compresslevel=9))
+    print(f"Wrote {_OUT_PATH} ({_OUT_PATH.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,12 +13,8 @@ interface VideoSessionProps {
   onDisconnect: () => void
 }
 
-interface Landmark {
-  x: number
-  y: number
-  z: number
-  v: number
-}
+// Flat landmark row from the backend: [x, y, z, visibility]
+type Landmark = [number, number, number, number]
 
 interface TranscriptLine {
   id: string
@@ -28,7 +24,7 @@ interface TranscriptLine {
 }
 
 function isUpperBody(landmarks: Landmark[]): boolean {
-  return landmarks.slice(25, 33).every(lm => lm.v < 0.5)
+  return landmarks.slice(25, 33).every(lm => lm[3] < 0.5)
 }
 
 function formatTime(seconds: number): string {